@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Inline the CSS each page needs for its first paint
+
+For every built page the stylesheet rules used by the above-the-fold
+markup are inlined in the head, and the full stylesheet is loaded without
+blocking rendering. Where the fold falls is set per page in
+site_config.json ("fold": the Nth occurrence of a marker in the body).
+
+Usage:
+    python3 critical_css.py        # report first-paint CSS bytes per page
+"""
+
+import re
+import glob
+import os
+
+from site_config import load_site_config
+
+STYLESHEET_HREF = '/assets/site.css'
+STYLESHEET_LINK = f'<link rel="stylesheet" href="{STYLESHEET_HREF}">'
+DEFAULT_FOLD = {'marker': '</section>', 'occurrence': 1}
+DEFAULT_MAX_BYTES = 8192
+
+# Selectors that apply to every page
+ALWAYS_MATCH = {'html', 'body', '*', ':root'}
+
+
+def parse_rules(css):
+    """Split a stylesheet into (at-rule prelude or None, selector, body) tuples"""
+    css = re.sub(r'/\*.*?\*/', '', css, flags=re.DOTALL)
+    rules = []
+    pos = 0
+    while True:
+        brace = css.find('{', pos)
+        if brace == -1:
+            break
+        prelude = css[pos:brace].strip()
+        if prelude.startswith('@'):
+            # One level of nesting, e.g. @media (...) { .a { ... } }
+            depth = 1
+            end = brace + 1
+            while depth and end < len(css):
+                if css[end] == '{':
+                    depth += 1
+                elif css[end] == '}':
+                    depth -= 1
+                end += 1
+            for _, selector, body in parse_rules(css[brace + 1:end - 1]):
+                rules.append((prelude, selector, body))
+            pos = end
+        else:
+            end = css.find('}', brace)
+            rules.append((None, prelude, css[brace + 1:end].strip()))
+            pos = end + 1
+    return rules
+
+
+def above_the_fold(html, fold):
+    """Body markup up to the end of the fold marker's Nth occurrence"""
+    body_start = html.find('<body')
+    body = html[body_start:] if body_start != -1 else html
+    pos = 0
+    for _ in range(fold['occurrence']):
+        index = body.find(fold['marker'], pos)
+        if index == -1:
+            return body
+        pos = index + len(fold['marker'])
+    return body[:pos]
+
+
+def markup_tokens(markup):
+    """Tags, classes, ids and attribute names used in a chunk of HTML"""
+    tags = set(t.lower() for t in re.findall(r'<([a-zA-Z][a-zA-Z0-9-]*)', markup))
+    classes = set()
+    for value in re.findall(r'\sclass="([^"]*)"', markup):
+        classes.update(value.split())
+    ids = set(re.findall(r'\sid="([^"]*)"', markup))
+    attributes = set(a.lower() for a in re.findall(r'\s([a-zA-Z][\w:-]*)=', markup))
+    return tags, classes, ids, attributes
+
+
+def selector_matches(selector, tokens):
+    """Whether every compound in a selector could match the markup"""
+    tags, classes, ids, attributes = tokens
+    if selector.strip() in ALWAYS_MATCH:
+        return True
+    # Pseudo-classes and pseudo-elements do not change which elements are involved
+    selector = re.sub(r'(?<!\\)::?[a-zA-Z-]+(\([^)]*\))?', '', selector)
+    for compound in re.split(r'\s*[\s>+~]\s*', selector.strip()):
+        if not compound or compound in ALWAYS_MATCH:
+            continue
+        tag = re.match(r'^[a-zA-Z][a-zA-Z0-9-]*', compound)
+        if tag and tag.group(0).lower() not in tags:
+            return False
+        if any(c.replace('\\', '') not in classes for c in re.findall(r'\.((?:\\.|[\w-])+)', compound)):
+            return False
+        if any(i not in ids for i in re.findall(r'#([\w-]+)', compound)):
+            return False
+        if any(a.lower() not in attributes for a in re.findall(r'\[([\w:-]+)', compound)):
+            return False
+    return True
+
+
+def critical_rules(css, markup, max_bytes):
+    """Minified CSS for the rules markup needs, capped at max_bytes
+
+    Returns (css, number of matching rules left out by the cap).
+    """
+    tokens = markup_tokens(markup)
+    chunks = []
+    size = 0
+    skipped = 0
+    for prelude, selector, body in parse_rules(css):
+        selectors = [s.strip() for s in selector.split(',') if selector_matches(s, tokens)]
+        if not selectors:
+            continue
+        declarations = ';'.join(re.sub(r'\s*:\s*', ':', d.strip(), count=1) for d in body.split(';') if d.strip())
+        rule = f"{','.join(selectors)}{{{declarations}}}"
+        if prelude:
+            rule = f"{prelude}{{{rule}}}"
+        if size + len(rule.encode('utf-8')) > max_bytes:
+            skipped += 1
+            continue
+        chunks.append(rule)
+        size += len(rule.encode('utf-8'))
+    return ''.join(chunks), skipped
+
+
+def inline_critical_css(html, css, page):
+    """Inline the page's critical CSS and load the full stylesheet asynchronously
+
+    Returns (html, inline bytes). Pages that do not link the shared
+    stylesheet are returned unchanged.
+    """
+    # Undo an earlier pass (e.g. a page kept from the previous build) so this stays idempotent
+    html = re.sub(
+        r'<style>[^<]*</style>\s*<link rel="preload" href="' + re.escape(STYLESHEET_HREF) + r'"[^>]*>\s*'
+        r'<noscript>' + re.escape(STYLESHEET_LINK) + r'</noscript>',
+        lambda m: STYLESHEET_LINK, html, count=1
+    )
+    if STYLESHEET_LINK not in html:
+        return html, 0
+
+    config = load_site_config()
+    page_config = config['pages'].get(page, {})
+    fold = page_config.get('fold', DEFAULT_FOLD)
+    max_bytes = config.get('critical_css_max_bytes', DEFAULT_MAX_BYTES)
+
+    critical, skipped = critical_rules(css, above_the_fold(html, fold), max_bytes)
+    if skipped:
+        print(f"  {page}: {skipped} critical rule(s) over the {max_bytes:,} byte cap left to {STYLESHEET_HREF}")
+
+    replacement = (
+        f'<style>{critical}</style>\n'
+        f'    <link rel="preload" href="{STYLESHEET_HREF}" as="style" onload="this.onload=null;this.rel=\'stylesheet\'">\n'
+        f'    <noscript>{STYLESHEET_LINK}</noscript>'
+    )
+    return html.replace(STYLESHEET_LINK, replacement, 1), len(critical.encode('utf-8'))
+
+
+def apply_critical_css(outputs, css):
+    """Inline critical CSS into every HTML page in outputs and report the sizes"""
+    css_bytes = len(css.encode('utf-8'))
+    for path in sorted(outputs):
+        if not path.endswith('.html'):
+            continue
+        page = os.path.splitext(os.path.basename(path))[0]
+        outputs[path], inline_bytes = inline_critical_css(outputs[path], css, page)
+        if inline_bytes or STYLESHEET_HREF in outputs[path]:
+            print(f"  {os.path.basename(path)}: {inline_bytes:,} bytes of CSS at first paint "
+                  f"(was {css_bytes:,} render-blocking)")
+    return outputs
+
+
+if __name__ == "__main__":
+    with open('public/assets/site.css', 'r') as f:
+        stylesheet = f.read()
+    config = load_site_config()
+    for path in sorted(glob.glob('public/*.html')):
+        page = os.path.splitext(os.path.basename(path))[0]
+        with open(path, 'r') as f:
+            html = f.read()
+        fold = config['pages'].get(page, {}).get('fold', DEFAULT_FOLD)
+        critical, _ = critical_rules(stylesheet, above_the_fold(html, fold),
+                                     config.get('critical_css_max_bytes', DEFAULT_MAX_BYTES))
+        print(f"{os.path.basename(path)}: {len(critical.encode('utf-8')):,} bytes critical of "
+              f"{len(stylesheet.encode('utf-8')):,}")
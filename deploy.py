@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+"""
+Differential deploy of the public/ directory
+
+Each deploy records a per-file content-hash manifest in the
+deployment_history of version.json, then syncs only the files that were
+added, changed or removed since the previous deploy to the same target.
+File contents are kept in a local content-addressed store so any earlier
+deployed version can be restored by syncing back to its manifest.
+
+Usage:
+    python3 deploy.py plan --target DIR
+    python3 deploy.py deploy --target DIR [--dry-run]
+    python3 deploy.py rollback VERSION --target DIR
+    python3 deploy.py history
+"""
+
+import os
+import json
+import shutil
+import hashlib
+import argparse
+from datetime import datetime
+
+VERSION_FILE = 'version.json'
+SOURCE_DIR = 'public'
+OBJECT_STORE = '.deploy/objects'
+
+
+def file_hash(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(65536), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def build_manifest(root=SOURCE_DIR):
+    """Map every file under root (relative path) to its sha256"""
+    manifest = {}
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(d for d in dirnames if not d.startswith('.'))
+        for filename in sorted(filenames):
+            if filename.startswith('.'):
+                continue
+            path = os.path.join(dirpath, filename)
+            manifest[os.path.relpath(path, root).replace(os.sep, '/')] = file_hash(path)
+    return dict(sorted(manifest.items()))
+
+
+def diff_manifests(old, new):
+    """Files to add, change and remove to turn old into new"""
+    added = sorted(path for path in new if path not in old)
+    changed = sorted(path for path in new if path in old and old[path] != new[path])
+    removed = sorted(path for path in old if path not in new)
+    return added, changed, removed
+
+
+def store_objects(manifest, root=SOURCE_DIR):
+    """Copy any file contents not yet in the object store"""
+    os.makedirs(OBJECT_STORE, exist_ok=True)
+    for path, digest in manifest.items():
+        stored = os.path.join(OBJECT_STORE, digest)
+        if not os.path.exists(stored):
+            shutil.copyfile(os.path.join(root, path), stored)
+
+
+class DirectoryTarget:
+    """Deploy target backed by a local directory"""
+
+    def __init__(self, path):
+        self.path = path
+
+    def put(self, relpath, source):
+        dest = os.path.join(self.path, relpath)
+        os.makedirs(os.path.dirname(dest), exist_ok=True)
+        shutil.copyfile(source, dest)
+
+    def delete(self, relpath):
+        dest = os.path.join(self.path, relpath)
+        if os.path.exists(dest):
+            os.remove(dest)
+        # Tidy up directories left empty
+        parent = os.path.dirname(dest)
+        while parent != self.path.rstrip(os.sep) and os.path.isdir(parent) and not os.listdir(parent):
+            os.rmdir(parent)
+            parent = os.path.dirname(parent)
+
+
+def missing_objects(manifest, paths):
+    """Paths whose content is not in the object store"""
+    return [path for path in paths if not os.path.exists(os.path.join(OBJECT_STORE, manifest[path]))]
+
+
+def sync(target, manifest, added, changed, removed):
+    """Upload added/changed files from the object store and delete removed ones
+
+    Every object is checked before the target is touched, so a missing
+    object never leaves the target half-synced.
+    """
+    missing = missing_objects(manifest, added + changed)
+    if missing:
+        raise FileNotFoundError(
+            f"{len(missing)} object(s) missing from {OBJECT_STORE}, nothing synced: {', '.join(missing)}"
+        )
+    transferred = 0
+    for path in added + changed:
+        source = os.path.join(OBJECT_STORE, manifest[path])
+        target.put(path, source)
+        transferred += os.path.getsize(source)
+    for path in removed:
+        target.delete(path)
+    return transferred
+
+
+def load_version_data():
+    with open(VERSION_FILE, 'r') as f:
+        version_data = json.load(f)
+    version_data.setdefault('deployed_version', None)
+    version_data.setdefault('deployment_history', [])
+    return version_data
+
+
+def save_version_data(version_data):
+    with open(VERSION_FILE, 'w') as f:
+        json.dump(version_data, f, indent=2)
+
+
+def current_entry(version_data, target):
+    """The last deployment_history entry for target, or None"""
+    for entry in reversed(version_data['deployment_history']):
+        if entry.get('target') == target:
+            return entry
+    return None
+
+
+def current_manifest(version_data, target):
+    """The manifest last deployed to target, or empty for a first deploy"""
+    entry = current_entry(version_data, target)
+    return entry['manifest'] if entry else {}
+
+
+def print_plan(added, changed, removed, manifest, root=None):
+    for label, paths in (('+', added), ('~', changed), ('-', removed)):
+        for path in paths:
+            print(f"  {label} {path}")
+    unchanged = len(manifest) - len(added) - len(changed)
+    print(f"  {len(added)} added, {len(changed)} changed, {len(removed)} removed, {unchanged} unchanged")
+    if root is not None:
+        upload = sum(os.path.getsize(os.path.join(root, path)) for path in added + changed)
+        total = sum(os.path.getsize(os.path.join(root, path)) for path in manifest)
+        print(f"  Upload {upload:,} of {total:,} bytes")
+
+
+def record(version_data, action, version, target, manifest, added, changed, removed, transferred, **extra):
+    entry = {
+        'version': version,
+        'action': action,
+        'target': target,
+        'deployed_at': datetime.now().isoformat() + 'Z',
+        'added': len(added),
+        'changed': len(changed),
+        'removed': len(removed),
+        'bytes_transferred': transferred,
+        'manifest': manifest,
+    }
+    entry.update(extra)
+    version_data['deployed_version'] = version
+    version_data['deployment_history'].append(entry)
+    save_version_data(version_data)
+
+
+def plan(args):
+    version_data = load_version_data()
+    manifest = build_manifest()
+    added, changed, removed = diff_manifests(current_manifest(version_data, args.target), manifest)
+    print(f"Plan for version {version_data['version']} -> {args.target}:")
+    print_plan(added, changed, removed, manifest, SOURCE_DIR)
+
+
+def deploy(args):
+    version_data = load_version_data()
+    version = version_data['version']
+    manifest = build_manifest()
+    added, changed, removed = diff_manifests(current_manifest(version_data, args.target), manifest)
+
+    print(f"Deploying version {version} to {args.target}...")
+    print_plan(added, changed, removed, manifest, SOURCE_DIR)
+    if args.dry_run:
+        print("Dry run - nothing synced")
+        return
+    if not (added or changed or removed):
+        print("Nothing to deploy")
+        return
+
+    store_objects(manifest)
+    transferred = sync(DirectoryTarget(args.target), manifest, added, changed, removed)
+    record(version_data, 'deploy', version, args.target, manifest, added, changed, removed, transferred)
+    print(f"Deployed version {version} ({transferred:,} bytes transferred)")
+
+
+def rollback(args):
+    version_data = load_version_data()
+    entries = [e for e in version_data['deployment_history']
+               if e['version'] == args.version and e.get('target') == args.target]
+    if not entries:
+        raise SystemExit(f"No deployment of version {args.version} to {args.target} in {VERSION_FILE}")
+    manifest = entries[-1]['manifest']
+    current = current_entry(version_data, args.target)
+    added, changed, removed = diff_manifests(current['manifest'], manifest)
+
+    print(f"Rolling {args.target} back to version {args.version}...")
+    print_plan(added, changed, removed, manifest)
+    missing = missing_objects(manifest, added + changed)
+    if missing:
+        # Objects are only kept in the local store of the machine that deployed them
+        for path in missing:
+            print(f"  missing {path} ({manifest[path]})")
+        raise SystemExit(f"Cannot roll back: {len(missing)} file(s) of version {args.version} are not in "
+                         f"{OBJECT_STORE}; nothing was changed on {args.target}")
+    transferred = sync(DirectoryTarget(args.target), manifest, added, changed, removed)
+    record(version_data, 'rollback', args.version, args.target, manifest, added, changed, removed, transferred,
+           rolled_back_from=current['version'])
+    print(f"Rolled back to version {args.version} ({transferred:,} bytes transferred)")
+
+
+def history(args):
+    version_data = load_version_data()
+    print(f"Deployed version: {version_data['deployed_version']}")
+    for entry in version_data['deployment_history']:
+        print(f"  {entry['deployed_at']}  {entry['action']:<8} v{entry['version']:<6} -> {entry['target']}  "
+              f"+{entry['added']} ~{entry['changed']} -{entry['removed']}  "
+              f"{entry['bytes_transferred']:,} bytes")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Differential deploy of the public/ directory')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    plan_parser = commands.add_parser('plan', help='Show what a deploy would sync')
+    plan_parser.add_argument('--target', required=True, help='Directory to deploy to')
+    plan_parser.set_defaults(func=plan)
+
+    deploy_parser = commands.add_parser('deploy', help='Sync changed files and record the deploy')
+    deploy_parser.add_argument('--target', required=True, help='Directory to deploy to')
+    deploy_parser.add_argument('--dry-run', action='store_true', help='Show the plan without syncing')
+    deploy_parser.set_defaults(func=deploy)
+
+    rollback_parser = commands.add_parser('rollback', help='Restore an earlier deployed version')
+    rollback_parser.add_argument('version', help='Version to roll back to, e.g. 1.22')
+    rollback_parser.add_argument('--target', required=True, help='Directory to roll back')
+    rollback_parser.set_defaults(func=rollback)
+
+    history_parser = commands.add_parser('history', help='List recorded deploys')
+    history_parser.set_defaults(func=history)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
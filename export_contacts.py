@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+"""
+Export contact form submissions stored in KV into a local SQLite database
+
+functions/api/contact.js stores each submission in the CONTACT_FORMS KV
+namespace under contact_<epoch ms>_<email>. This reads a KV dump or a local
+KV stand-in page by page and streams the records into SQLite, indexed by
+timestamp, email and topic. The timestamp in the key is the watermark:
+later runs skip every key older than the newest submission already
+ingested, less an overlap window (--overlap, 5 minutes by default). KV
+listings are eventually consistent, so a key written shortly before the
+newest one may only appear in a later dump; re-reading the overlap is
+harmless because existing keys are ignored.
+
+Sources:
+    DIR            one file per key, named by the key, holding the JSON value
+                   (the layout load_test_contact.py --kv-dir writes)
+    FILE.jsonl     one {"key": ..., "value": ...} object per line
+    FILE.json      a JSON array of {"key"/"name": ..., "value": ...} objects
+
+Usage:
+    python3 export_contacts.py ingest SOURCE [--db contacts.db] [--overlap 300]
+    python3 export_contacts.py export [--db contacts.db] [--output leads.csv] [--since 2025-09-01] [--topic ...] [--raw]
+    python3 export_contacts.py stats [--db contacts.db]
+"""
+
+import os
+import csv
+import sys
+import json
+import sqlite3
+import argparse
+from datetime import datetime, timezone
+
+KEY_PREFIX = 'contact_'
+DEFAULT_DB = 'contacts.db'
+DEFAULT_PAGE_SIZE = 1000
+DEFAULT_OVERLAP_SECONDS = 300
+
+# Cells starting with these are run as formulas by Excel and Google Sheets
+FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+
+# Form fields, in the order contact.js builds them
+FIELDS = [
+    'topic', 'other_topic', 'name', 'email', 'facility_name', 'resident_count',
+    'phone', 'current_solution', 'contact_preference', 'timestamp', 'ip', 'country',
+]
+
+SCHEMA = f'''
+CREATE TABLE IF NOT EXISTS contacts (
+    key TEXT PRIMARY KEY,
+    submitted_ms INTEGER NOT NULL,
+    {', '.join(f'{field} TEXT' for field in FIELDS)},
+    raw TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS contacts_submitted_ms ON contacts (submitted_ms);
+CREATE INDEX IF NOT EXISTS contacts_email ON contacts (email COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS contacts_topic ON contacts (topic, submitted_ms);
+'''
+
+
+def parse_key(key):
+    """Split contact_<ms>_<email> into (ms, email); None if it is not a contact key"""
+    if not key.startswith(KEY_PREFIX):
+        return None
+    parts = key[len(KEY_PREFIX):].split('_', 1)
+    if len(parts) != 2 or not parts[0].isdigit():
+        return None
+    return int(parts[0]), parts[1]
+
+
+def connect(path):
+    db = sqlite3.connect(path)
+    db.execute('PRAGMA journal_mode=WAL')
+    db.executescript(SCHEMA)
+    return db
+
+
+def watermark(db):
+    """Timestamp (ms) of the newest submission already ingested"""
+    row = db.execute('SELECT MAX(submitted_ms) FROM contacts').fetchone()
+    return row[0] or 0
+
+
+def directory_source(path, since_ms, page_size):
+    """Yield pages of (key, value) from a directory with one file per key
+
+    Keys are filtered against the watermark before any value is read.
+    """
+    keys = []
+    for name in os.listdir(path):
+        parsed = parse_key(name)
+        if parsed and parsed[0] >= since_ms:
+            keys.append((parsed[0], name))
+    keys.sort()
+    for start in range(0, len(keys), page_size):
+        page = []
+        for _, key in keys[start:start + page_size]:
+            with open(os.path.join(path, key), 'r') as f:
+                page.append((key, f.read()))
+        yield page
+
+
+def dump_records(path):
+    """Yield (key, value) from a .jsonl (streamed) or .json dump"""
+    with open(path, 'r') as f:
+        if path.endswith('.jsonl'):
+            for line in f:
+                if line.strip():
+                    record = json.loads(line)
+                    yield record.get('key', record.get('name')), record['value']
+        else:
+            for record in json.load(f):
+                yield record.get('key', record.get('name')), record['value']
+
+
+def dump_source(path, since_ms, page_size):
+    """Yield pages of (key, value) from a dump file, skipping keys older than the watermark"""
+    page = []
+    for key, value in dump_records(path):
+        parsed = parse_key(key or '')
+        if not parsed or parsed[0] < since_ms:
+            continue
+        page.append((key, value))
+        if len(page) >= page_size:
+            yield page
+            page = []
+    if page:
+        yield page
+
+
+def to_row(key, value):
+    submitted_ms, key_email = parse_key(key)
+    data = json.loads(value) if isinstance(value, str) else value
+    row = [key, submitted_ms]
+    for field in FIELDS:
+        item = data.get(field)
+        if field == 'email' and not item:
+            item = key_email
+        row.append(None if item is None else str(item))
+    row.append(json.dumps(data, sort_keys=True))
+    return row
+
+
+def ingest(args):
+    db = connect(args.db)
+    since_ms = 0 if args.full else max(0, watermark(db) - args.overlap * 1000)
+    if os.path.isdir(args.source):
+        pages = directory_source(args.source, since_ms, args.page_size)
+    else:
+        pages = dump_source(args.source, since_ms, args.page_size)
+
+    placeholders = ', '.join('?' * (len(FIELDS) + 3))
+    inserted = 0
+    seen = 0
+    for page in pages:
+        rows = []
+        for key, value in page:
+            try:
+                rows.append(to_row(key, value))
+            except (ValueError, AttributeError) as e:
+                print(f"  Skipping {key}: {e}")
+        with db:
+            before = db.total_changes
+            db.executemany(f'INSERT OR IGNORE INTO contacts VALUES ({placeholders})', rows)
+            inserted += db.total_changes - before
+        seen += len(page)
+
+    print(f"Read {seen} key(s) at or after {format_ms(since_ms)}; {inserted} new submission(s)")
+    print(f"Watermark is now {format_ms(watermark(db))}")
+    db.close()
+
+
+def parse_date(value):
+    """ISO date or datetime (UTC) to epoch ms"""
+    moment = datetime.fromisoformat(value)
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return int(moment.timestamp() * 1000)
+
+
+def format_ms(ms):
+    if not ms:
+        return 'none'
+    return datetime.fromtimestamp(ms / 1000, tz=timezone.utc).strftime('%Y-%m-%d %H:%M:%S UTC')
+
+
+def csv_safe(value):
+    """Quote a form value so spreadsheets show it as text rather than run it as a formula"""
+    if value and value.startswith(FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+def export(args):
+    db = connect(args.db)
+    conditions = []
+    params = []
+    if args.since:
+        conditions.append('submitted_ms >= ?')
+        params.append(parse_date(args.since))
+    if args.until:
+        conditions.append('submitted_ms < ?')
+        params.append(parse_date(args.until))
+    if args.topic:
+        conditions.append('topic = ?')
+        params.append(args.topic)
+    if args.email:
+        conditions.append('email = ? COLLATE NOCASE')
+        params.append(args.email)
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ''
+
+    # Rows are streamed straight from the cursor, so memory use does not grow with the table
+    cursor = db.execute(f'SELECT {", ".join(FIELDS)} FROM contacts {where} ORDER BY submitted_ms', params)
+    output = open(args.output, 'w', newline='') if args.output else sys.stdout
+    try:
+        writer = csv.writer(output)
+        writer.writerow(FIELDS)
+        count = 0
+        for row in cursor:
+            # Values come straight from the public contact form
+            writer.writerow(row if args.raw else [csv_safe(value) for value in row])
+            count += 1
+    finally:
+        if args.output:
+            output.close()
+    if args.output:
+        print(f"Exported {count} submission(s) to {args.output}")
+    db.close()
+
+
+def stats(args):
+    db = connect(args.db)
+    total, first, last = db.execute(
+        'SELECT COUNT(*), MIN(submitted_ms), MAX(submitted_ms) FROM contacts'
+    ).fetchone()
+    print(f"{total} submission(s) from {format_ms(first)} to {format_ms(last)}")
+    for topic, count in db.execute(
+        'SELECT topic, COUNT(*) FROM contacts GROUP BY topic ORDER BY COUNT(*) DESC'
+    ):
+        print(f"  {count:>6}  {topic}")
+    db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Export contact form submissions from KV into SQLite')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    ingest_parser = commands.add_parser('ingest', help='Load new submissions from a KV dump or directory')
+    ingest_parser.add_argument('source', help='KV directory, .jsonl dump or .json dump')
+    ingest_parser.add_argument('--db', default=DEFAULT_DB, help='SQLite database file')
+    ingest_parser.add_argument('--page-size', type=int, default=DEFAULT_PAGE_SIZE, help='Keys read per page')
+    ingest_parser.add_argument('--overlap', type=int, default=DEFAULT_OVERLAP_SECONDS,
+                               help='Seconds before the watermark to re-read, for keys listed late by KV')
+    ingest_parser.add_argument('--full', action='store_true', help='Ignore the watermark and re-read every key')
+    ingest_parser.set_defaults(func=ingest)
+
+    export_parser = commands.add_parser('export', help='Write submissions as CSV')
+    export_parser.add_argument('--db', default=DEFAULT_DB, help='SQLite database file')
+    export_parser.add_argument('--output', help='CSV file (default: stdout)')
+    export_parser.add_argument('--since', help='Only submissions on or after this UTC date/time')
+    export_parser.add_argument('--until', help='Only submissions before this UTC date/time')
+    export_parser.add_argument('--topic', help='Only submissions with this topic')
+    export_parser.add_argument('--email', help='Only submissions from this email')
+    export_parser.add_argument('--raw', action='store_true',
+                               help="Write values as submitted, without the ' that stops spreadsheets running formulas")
+    export_parser.set_defaults(func=export)
+
+    stats_parser = commands.add_parser('stats', help='Summarise the ingested submissions')
+    stats_parser.add_argument('--db', default=DEFAULT_DB, help='SQLite database file')
+    stats_parser.set_defaults(func=stats)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
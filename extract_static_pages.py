@@ -6,9 +6,52 @@ Handles: home, faq, privacy, cookies, terms
 
 import re
 import os
+import glob
 import json
+import time
+import hashlib
+import argparse
+import tempfile
 import subprocess
-from datetime import datetime
+from datetime import datetime, timezone
+
+from live_reload import PreviewServer
+from site_config import CONFIG_FILE, analytics_snippet_files, analytics_snippet
+from redirects import REDIRECTS_FILE, load_rules, check_rules, compile_redirects, rewrite_links
+from critical_css import apply_critical_css
+
+# Stands in for the version number while pages are built, so the content
+# hash used by --deterministic does not depend on the version itself
+BUILD_VERSION_PLACEHOLDER = '__BUILD_VERSION__'
+
+# Rails sources for the home page
+HOME_TEMPLATE = '../app/views/pages/home.html.erb'
+FOOTER_TEMPLATE = '../app/views/shared/_footer.html.erb'
+
+# Rails pages extracted into the static site
+LEGAL_PAGES = [
+    {
+        'name': 'privacy',
+        'path': '/privacy',
+        'output': 'public/privacy.html',
+        'title': 'Privacy Policy | ResidentCheckin.co',
+        'description': 'ResidentCheckin.co privacy policy. Learn how we collect, use, and protect your personal information.'
+    },
+    {
+        'name': 'cookies',
+        'path': '/cookies',
+        'output': 'public/cookies.html',
+        'title': 'Cookie Policy | ResidentCheckin.co',
+        'description': 'ResidentCheckin.co cookie policy. Learn about the cookies we use and how to manage your preferences.'
+    },
+    {
+        'name': 'terms',
+        'path': '/terms',
+        'output': 'public/terms.html',
+        'title': 'Terms of Service | ResidentCheckin.co',
+        'description': 'ResidentCheckin.co terms of service. Read our terms and conditions for using our automated wellness monitoring service.'
+    }
+]
 
 def get_page_content(page_path):
     """Fetch a page from the Rails dev server"""
@@ -28,12 +71,12 @@ def get_page_content(page_path):
         print(f"Exception fetching {page_path}: {e}")
         return None
 
-def extract_home_page():
+def extract_home_page(version):
     """Extract and process the home page from Rails ERB template"""
     print("Extracting home page...")
     
     # Read the home page ERB template
-    with open('../app/views/pages/home.html.erb', 'r') as f:
+    with open(HOME_TEMPLATE, 'r') as f:
         content = f.read()
     
     # Read the home page navigation
@@ -41,7 +84,7 @@ def extract_home_page():
         nav_content = f.read()
     
     # Read the footer partial
-    with open('../app/views/shared/_footer.html.erb', 'r') as f:
+    with open(FOOTER_TEMPLATE, 'r') as f:
         footer_content = f.read()
     
     # Replace the Rails navigation with shared navigation
@@ -135,15 +178,6 @@ def extract_home_page():
         # Replace the Rails form with the static form
         content = content[:form_start] + static_form + content[form_end:]
     
-    # Load version info
-    version_file = 'version.json'
-    try:
-        with open(version_file, 'r') as f:
-            version_data = json.load(f)
-            version = version_data.get('version', '1.01')
-    except FileNotFoundError:
-        version = '1.01'
-    
     # Update version in footer content
     footer_content = re.sub(r'v\d+\.\d+', f'v{version}', footer_content)
     
@@ -154,99 +188,60 @@ def extract_home_page():
     # Remove any remaining ERB tags
     content = re.sub(r'<%=?[^%>]*%>', '', content)
     
-    # Update links to point to dev site for testing
-    content = content.replace('href="/facility/onboarding"', 'href="https://dev.residentcheckin.co/facility/onboarding"')
-    content = content.replace('href="/users/sign_in"', 'href="https://dev.residentcheckin.co/users/sign_in"')
-    # Keep FAQ link local since we'll have that page
-    content = content.replace('href="https://dev.residentcheckin.co/users/sign_in"', 'href="https://dev.residentcheckin.co/users/sign_in"')
+    # Point links at their final destination from redirects.json
+    content = rewrite_links(content, load_rules())
     
     return content
 
-def create_html_wrapper(content, title, description):
-    """Wrap content in a full HTML document"""
-    return f'''<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>{title}</title>
-    <meta name="description" content="{description}">
-    
-    <!-- Tailwind CSS -->
-    <script src="https://cdn.tailwindcss.com"></script>
-    
-    <!-- Favicon -->
-    <link rel="icon" type="image/x-icon" href="/favicon.ico">
-    
-    <!-- Open Graph Tags -->
-    <meta property="og:title" content="{title}">
-    <meta property="og:description" content="{description}">
-    <meta property="og:image" content="/Facility-screenshot.png">
-    <meta property="og:url" content="https://residentcheckin.co">
-    <meta property="og:type" content="website">
-    
-    <style>
-        html {{
-            scroll-behavior: smooth;
-        }}
-        
-        .faq-question {{
-            transition: all 0.3s ease;
-        }}
-        .faq-question:hover {{
-            background-color: #f3f4f6;
-        }}
-        .rotate-180 {{
-            transform: rotate(180deg);
-        }}
-        .faq-icon {{
-            transition: transform 0.3s ease;
-        }}
-    </style>
-</head>
-<body>
-{content}
+# Stylesheet and script shared by every page built with create_html_wrapper.
+# Written once to public/assets/ so browsers cache them across pages.
+SITE_CSS = '''html {
+    scroll-behavior: smooth;
+}
 
-<!-- Google tag (gtag.js) -->
-<script async src="https://www.googletagmanager.com/gtag/js?id=G-C2J67LGNNQ"></script>
-<script>
-  window.dataLayer = window.dataLayer || [];
-  function gtag(){{dataLayer.push(arguments);}}
-  gtag('js', new Date());
-  gtag('config', 'G-C2J67LGNNQ');
-</script>
-
-<!-- FAQ Page Scripts -->
-<script>
-document.addEventListener('DOMContentLoaded', function() {{
+.faq-question {
+    transition: all 0.3s ease;
+}
+.faq-question:hover {
+    background-color: #f3f4f6;
+}
+.rotate-180 {
+    transform: rotate(180deg);
+}
+.faq-icon {
+    transition: transform 0.3s ease;
+}
+'''
+
+SITE_JS = r'''document.addEventListener('DOMContentLoaded', function() {
     // FAQ accordion functionality
     const faqButtons = document.querySelectorAll('[data-answer-id]');
     
-    faqButtons.forEach(button => {{
-        button.addEventListener('click', function() {{
+    faqButtons.forEach(button => {
+        button.addEventListener('click', function() {
             const answerId = this.dataset.answerId;
             const answer = document.getElementById(answerId);
             const icon = this.querySelector('.faq-icon');
             
-            if (answer.classList.contains('hidden')) {{
+            if (answer.classList.contains('hidden')) {
                 answer.classList.remove('hidden');
                 answer.classList.add('block');
                 icon.classList.add('rotate-180');
                 this.setAttribute('aria-expanded', 'true');
-            }} else {{
+            } else {
                 answer.classList.add('hidden');
                 answer.classList.remove('block');
                 icon.classList.remove('rotate-180');
                 this.setAttribute('aria-expanded', 'false');
-            }}
-        }});
-    }});
+            }
+        });
+    });
     
     // Expand All functionality
     const expandAll = document.querySelector('[data-action="expandAll"]');
-    if (expandAll) {{
-        expandAll.addEventListener('click', function() {{
-            document.querySelectorAll('[data-answer-id]').forEach(button => {{
+    if (expandAll) {
+        expandAll.addEventListener('click', function() {
+            document.querySelectorAll('[data-answer-id]').forEach(button => {
                 const answerId = button.dataset.answerId;
                 const answer = document.getElementById(answerId);
                 const icon = button.querySelector('.faq-icon');
@@ -255,15 +250,15 @@ document.addEventListener('DOMContentLoaded', function() {{
                 answer.classList.add('block');
                 icon.classList.add('rotate-180');
                 button.setAttribute('aria-expanded', 'true');
-            }});
-        }});
-    }}
+            });
+        });
+    }
     
     // Collapse All functionality
     const collapseAll = document.querySelector('[data-action="collapseAll"]');
-    if (collapseAll) {{
-        collapseAll.addEventListener('click', function() {{
-            document.querySelectorAll('[data-answer-id]').forEach(button => {{
+    if (collapseAll) {
+        collapseAll.addEventListener('click', function() {
+            document.querySelectorAll('[data-answer-id]').forEach(button => {
                 const answerId = button.dataset.answerId;
                 const answer = document.getElementById(answerId);
                 const icon = button.querySelector('.faq-icon');
@@ -272,32 +267,32 @@ document.addEventListener('DOMContentLoaded', function() {{
                 answer.classList.remove('block');
                 icon.classList.remove('rotate-180');
                 button.setAttribute('aria-expanded', 'false');
-            }});
-        }});
-    }}
+            });
+        });
+    }
     
     // Contact form handler
     const form = document.querySelector('[data-contact-form]');
-    if (form) {{
+    if (form) {
         const submitButton = form.querySelector('button[type="submit"]');
         const originalButtonText = submitButton.textContent;
         
-        form.addEventListener('submit', async function(e) {{
+        form.addEventListener('submit', async function(e) {
             e.preventDefault();
             
             submitButton.disabled = true;
             submitButton.textContent = 'Sending...';
             
-            try {{
+            try {
                 const formData = new FormData(form);
-                const response = await fetch('/api/contact', {{
+                const response = await fetch('/api/contact', {
                     method: 'POST',
                     body: formData
-                }});
+                });
                 
                 const result = await response.json();
                 
-                if (response.ok && result.success) {{
+                if (response.ok && result.success) {
                     form.innerHTML = `
                         <div class="text-center py-8">
                             <div class="mb-4">
@@ -306,166 +301,448 @@ document.addEventListener('DOMContentLoaded', function() {{
                                 </svg>
                             </div>
                             <h3 class="text-2xl font-semibold text-gray-900 mb-2">Thank You!</h3>
-                            <p class="text-gray-600">${{result.message || "We'll be in touch soon."}}</p>
+                            <p class="text-gray-600">${result.message || "We'll be in touch soon."}</p>
                         </div>
                     `;
-                }} else {{
+                } else {
                     alert(result.message || 'There was an error submitting the form. Please try again.');
                     submitButton.disabled = false;
                     submitButton.textContent = originalButtonText;
-                }}
-            }} catch (error) {{
+                }
+            } catch (error) {
                 console.error('Form submission error:', error);
                 alert('There was an error submitting the form. Please try again later.');
                 submitButton.disabled = false;
                 submitButton.textContent = originalButtonText;
-            }}
-        }});
-    }}
+            }
+        });
+    }
     
     // Mobile menu functionality
     const mobileMenuButton = document.getElementById('mobile-menu-button');
     const mobileMenu = document.getElementById('mobile-menu');
     const menuIcon = document.getElementById('menu-icon');
 
-    if (mobileMenuButton && mobileMenu && menuIcon) {{
-        mobileMenuButton.addEventListener('click', function() {{
+    if (mobileMenuButton && mobileMenu && menuIcon) {
+        mobileMenuButton.addEventListener('click', function() {
             const isHidden = mobileMenu.classList.contains('hidden');
             
-            if (isHidden) {{
+            if (isHidden) {
                 mobileMenu.classList.remove('hidden');
                 menuIcon.setAttribute('d', 'M6 18L18 6M6 6l12 12'); // X icon
-            }} else {{
+            } else {
                 mobileMenu.classList.add('hidden');
                 menuIcon.setAttribute('d', 'M4 6h16M4 12h16M4 18h16'); // Hamburger icon
-            }}
-        }});
-    }}
-}});
+            }
+        });
+    }
+});
 
-function toggleOtherField(select) {{
+function toggleOtherField(select) {
     const otherField = document.getElementById('other-topic-field');
-    if (select.value === 'Other') {{
+    if (select.value === 'Other') {
         otherField.style.display = 'block';
-    }} else {{
+    } else {
         otherField.style.display = 'none';
-    }}
-}}
-</script>
+    }
+}
+'''
+
+# Markers tried in order to find the page body inside a Rails-rendered document
+MAIN_CONTENT_PATTERNS = [
+    r'<!-- BEGIN app/views/pages/[^>]*-->(.*?)<!-- END app/views/pages/[^>]*-->',
+    r'(<main\b[^>]*>.*?</main>)',
+    r'<body\b[^>]*>(.*?)</body>',
+]
+
+def shared_assets():
+    """The shared stylesheet and script, keyed by output path"""
+    return {
+        'public/assets/site.css': SITE_CSS,
+        'public/assets/site.js': SITE_JS,
+    }
+
+def create_html_wrapper(content, title, description, page):
+    """Wrap content in a full HTML document
+
+    page names the entry in site_config.json used for per-page settings.
+    """
+    return f'''<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>{title}</title>
+    <meta name="description" content="{description}">
+    
+    <!-- Tailwind CSS -->
+    <script src="https://cdn.tailwindcss.com"></script>
+    
+    <!-- Favicon -->
+    <link rel="icon" type="image/x-icon" href="/favicon.ico">
+    
+    <!-- Open Graph Tags -->
+    <meta property="og:title" content="{title}">
+    <meta property="og:description" content="{description}">
+    <meta property="og:image" content="/Facility-screenshot.png">
+    <meta property="og:url" content="https://residentcheckin.co">
+    <meta property="og:type" content="website">
+    
+    <link rel="stylesheet" href="/assets/site.css">
+</head>
+<body>
+{content}
+
+{analytics_snippet(page)}
+<!-- Accordion, contact form and mobile menu -->
+<script src="/assets/site.js"></script>
 
 </body>
 </html>'''
 
-def extract_other_pages():
-    """Generate FAQ using template, extract other pages from Rails"""
-    
-    # Generate FAQ using our clean template
+def extract_main_content(html):
+    """Pull the page's own content region out of a full Rails document"""
+    for pattern in MAIN_CONTENT_PATTERNS:
+        match = re.search(pattern, html, flags=re.DOTALL)
+        if match:
+            return match.group(1).strip()
+    return html
+
+def decode_cf_email(encoded):
+    """Decode a Cloudflare email-obfuscation hex string"""
+    key = int(encoded[:2], 16)
+    return ''.join(chr(int(encoded[i:i + 2], 16) ^ key) for i in range(2, len(encoded), 2))
+
+def decode_cf_emails(content):
+    """Restore addresses that Cloudflare obfuscated when the page was served
+
+    The decoder script is not part of the extracted content, so the
+    obfuscated placeholders would otherwise show as "[email protected]".
+    """
+    content = re.sub(
+        r'<a href="/cdn-cgi/l/email-protection" class="__cf_email__" data-cfemail="([0-9a-f]+)">[^<]*</a>',
+        lambda m: decode_cf_email(m.group(1)), content
+    )
+    content = re.sub(
+        r'<span class="__cf_email__" data-cfemail="([0-9a-f]+)">[^<]*</span>',
+        lambda m: decode_cf_email(m.group(1)), content
+    )
+    content = re.sub(
+        r'href="/cdn-cgi/l/email-protection#([0-9a-f]+)"',
+        lambda m: f'href="mailto:{decode_cf_email(m.group(1))}"', content
+    )
+    return content
+
+def build_redirects():
+    """Compile redirects.json into public/_redirects, keyed by output path"""
+    rules = load_rules()
+    for kind, message in check_rules(rules):
+        print(f"  Redirect warning [{kind}]: {message}")
+    return {'public/_redirects': compile_redirects(rules)}
+
+def build_home_page():
+    """Build the home page, keyed by output path"""
+    home_content = extract_home_page(BUILD_VERSION_PLACEHOLDER)
+    return {
+        'public/index.html': create_html_wrapper(
+            home_content, 
+            "ResidentCheckin.co - Automated Wellness Checks for Senior Living Communities",
+            "Save 20+ hours per week on wellness checks. Automated safety monitoring and resident communications for independent living facilities. Trusted since 2012.",
+            'index'
+        )
+    }
+
+def generate_faq_page():
+    """Generate FAQ using template, keyed by output path"""
     print("Generating FAQ page from template...")
-    os.system("ruby generate_faq_static.rb")
-    print("  Saved to public/faq.html")
     
-    # Extract other pages from Rails
-    pages = [
-        {
-            'path': '/privacy',
-            'output': 'public/privacy.html',
-            'title': 'Privacy Policy | ResidentCheckin.co',
-            'description': 'ResidentCheckin.co privacy policy. Learn how we collect, use, and protect your personal information.'
-        },
-        {
-            'path': '/cookies',
-            'output': 'public/cookies.html',
-            'title': 'Cookie Policy | ResidentCheckin.co',
-            'description': 'ResidentCheckin.co cookie policy. Learn about the cookies we use and how to manage your preferences.'
-        },
-        {
-            'path': '/terms',
-            'output': 'public/terms.html',
-            'title': 'Terms of Service | ResidentCheckin.co',
-            'description': 'ResidentCheckin.co terms of service. Read our terms and conditions for using our automated wellness monitoring service.'
-        }
-    ]
+    # Render to a scratch file outside public/ so public/faq.html is only
+    # rewritten by write_outputs, and only when the final page actually changes
+    with tempfile.TemporaryDirectory() as scratch_dir:
+        scratch = os.path.join(scratch_dir, 'faq.html')
+        result = subprocess.run(
+            ['ruby', 'generate_faq_static.rb'],
+            env=dict(os.environ, FAQ_OUTPUT=scratch),
+            stderr=subprocess.PIPE,
+            text=True
+        )
+        if result.returncode != 0:
+            raise RuntimeError(f"generate_faq_static.rb exited with status {result.returncode}:\n"
+                               f"{result.stderr.strip()}")
+        with open(scratch, 'r') as f:
+            faq_html = f.read()
+    
+    outputs = {'public/faq.html': rewrite_links(faq_html, load_rules())}
+    for path in sorted(glob.glob('public/faq-search.*.json')):
+        with open(path, 'r') as f:
+            outputs[path] = f.read()
+    return outputs
+
+def extract_other_pages():
+    """Generate FAQ using template, extract other pages from Rails
+
+    Returns the generated pages keyed by output path.
+    """
+    outputs = generate_faq_page()
     
-    for page in pages:
+    # Extract other pages from Rails
+    original_total = 0
+    converted_total = 0
+    for page in LEGAL_PAGES:
         print(f"Extracting {page['path']}...")
         content = get_page_content(page['path'])
         
         if content:
-            # Remove ALL Rails-specific JavaScript module imports
-            content = re.sub(r'<link rel="modulepreload"[^>]*>', '', content)
-            content = re.sub(r'<script type="module">import "application"</script>', '', content)
-            
-            # Clean up Rails-specific elements
-            # Remove Rails asset pipeline references
-            content = re.sub(r'<link[^>]*data-turbo-track[^>]*>', '', content)
-            content = re.sub(r'<script[^>]*data-turbo-track[^>]*>.*?</script>', '', content, flags=re.DOTALL)
+            html = convert_rails_page(content, page)
+            outputs[page['output']] = html
             
-            # Remove CSRF tokens
-            content = re.sub(r'<meta name="csrf-[^"]*"[^>]*>', '', content)
-            
-            # Fix links to point to appropriate locations
-            content = content.replace('href="/facility/onboarding"', 'href="https://dev.residentcheckin.co/facility/onboarding"')
-            content = content.replace('href="/users/sign_in"', 'href="https://dev.residentcheckin.co/users/sign_in"')
-            
-            # Keep internal navigation working
-            content = content.replace('href="/#', 'href="/#')
-            
-            # Save the page
-            with open(page['output'], 'w') as f:
-                f.write(content)
-            print(f"  Saved to {page['output']}")
+            original_size = len(content.encode('utf-8'))
+            converted_size = len(html.encode('utf-8'))
+            original_total += original_size
+            converted_total += converted_size
+            print(f"  Built {page['output']} "
+                  f"({original_size:,} -> {converted_size:,} bytes, {size_change(original_size, converted_size)})")
+        elif os.path.exists(page['output']):
+            # Keep the last good copy so the build output stays complete
+            print(f"  Failed to extract {page['path']}, keeping existing {page['output']}")
+            with open(page['output'], 'r') as f:
+                outputs[page['output']] = f.read()
         else:
             print(f"  Failed to extract {page['path']}")
+    
+    if original_total:
+        print(f"  Rails pages total: {original_total:,} -> {converted_total:,} bytes "
+              f"({size_change(original_total, converted_total)})")
+    
+    return outputs
 
-def main():
-    """Main extraction process"""
-    print("Starting static page extraction...")
-    print("=" * 50)
+def convert_rails_page(content, page):
+    """Keep only the page content from a Rails document and re-wrap it in the shared shell"""
+    content = extract_main_content(content)
+    
+    # Drop external scripts left inside the content region (e.g. Cloudflare's
+    # email decoder); inline ones belong to the page, like openCookiePreferences()
+    content = re.sub(r'<script\b[^>]*\bsrc=[^>]*>\s*</script>', '', content)
+    content = decode_cf_emails(content)
     
-    # Load and update version
-    version_file = 'version.json'
+    # Point links at their final destination from redirects.json
+    content = rewrite_links(content, load_rules())
+    
+    return create_html_wrapper(content, page['title'], page['description'], page['name'])
+
+def size_change(before, after):
+    """Format a byte count change as a percentage"""
+    return f"{(after - before) / before * 100:+.0f}%"
+
+def load_version_data():
+    """Read version.json, or start a new one"""
     try:
-        with open(version_file, 'r') as f:
-            version_data = json.load(f)
+        with open('version.json', 'r') as f:
+            return json.load(f)
     except FileNotFoundError:
-        version_data = {
+        return {
             "version": "1.01",
-            "last_updated": datetime.now().isoformat() + 'Z',
+            "last_updated": build_timestamp(),
             "deployed_version": None,
             "deployment_history": []
         }
+
+def save_version_data(version_data):
+    with open('version.json', 'w') as f:
+        json.dump(version_data, f, indent=2)
+
+def next_version(version):
+    """Minor version bump, e.g. 1.22 -> 1.23"""
+    major, minor = version.split('.')
+    return f"{major}.{int(minor) + 1:02d}"
+
+def build_timestamp():
+    """Build time, taken from SOURCE_DATE_EPOCH when set for reproducible builds"""
+    epoch = os.environ.get('SOURCE_DATE_EPOCH')
+    if epoch:
+        return datetime.fromtimestamp(int(epoch), tz=timezone.utc).replace(tzinfo=None).isoformat() + 'Z'
+    return datetime.now().isoformat() + 'Z'
+
+def build_outputs():
+    """Build every page in memory, keyed by output path
+
+    The version number is left as BUILD_VERSION_PLACEHOLDER.
+    """
+    # Shared stylesheet and script used by every wrapped page
+    outputs = shared_assets()
     
-    # Increment version (minor version bump)
-    current_version = version_data.get('version', '1.01')
-    major, minor = current_version.split('.')
-    minor = int(minor) + 1
-    new_version = f"{major}.{minor:02d}"
+    # Redirects, compiled from redirects.json
+    outputs.update(build_redirects())
     
-    # Update version data
-    version_data['version'] = new_version
-    version_data['last_updated'] = datetime.now().isoformat() + 'Z'
+    # Extract home page
+    outputs.update(build_home_page())
+    print("Home page extracted")
     
-    # Save updated version
-    with open(version_file, 'w') as f:
-        json.dump(version_data, f, indent=2)
+    # Extract other pages
+    outputs.update(extract_other_pages())
     
-    print(f"Building version {new_version}...")
+    # Inline each page's above-the-fold CSS and load site.css without blocking
+    print("Inlining critical CSS...")
+    apply_critical_css(outputs, SITE_CSS)
     
-    # Extract home page
-    home_content = extract_home_page()
-    home_html = create_html_wrapper(
-        home_content, 
-        "ResidentCheckin.co - Automated Wellness Checks for Senior Living Communities",
-        "Save 20+ hours per week on wellness checks. Automated safety monitoring and resident communications for independent living facilities. Trusted since 2012."
-    )
+    return outputs
+
+def content_hash(outputs):
+    """Hash of all build output, independent of dict order"""
+    digest = hashlib.sha256()
+    for path in sorted(outputs):
+        content = outputs[path].encode('utf-8')
+        digest.update(path.encode('utf-8') + b'\0' + str(len(content)).encode('ascii') + b'\0' + content)
+    return digest.hexdigest()
+
+def write_outputs(outputs):
+    """Write files whose content changed; returns the changed paths"""
+    changed = []
+    for path in sorted(outputs):
+        content = outputs[path]
+        try:
+            with open(path, 'r') as f:
+                if f.read() == content:
+                    continue
+        except FileNotFoundError:
+            pass
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w') as f:
+            f.write(content)
+        changed.append(path)
+    return changed
+
+# Page builders used by --watch, and the build inputs each one depends on.
+# The legal pages are fetched from Rails, so they are not watched.
+PAGE_BUILDERS = {
+    'home': build_home_page,
+    'faq': generate_faq_page,
+    'redirects': build_redirects,
+}
+
+WATCH_INPUTS = {
+    HOME_TEMPLATE: ('home',),
+    FOOTER_TEMPLATE: ('home',),
+    'shared_nav_home.html': ('home',),
+    'faq_template.erb': ('faq',),
+    'generate_faq_static.rb': ('faq',),
+    'shared_nav_faq.html': ('faq',),
+    CONFIG_FILE: ('home', 'faq'),
+    REDIRECTS_FILE: ('home', 'faq', 'redirects'),
+}
+for snippet_file in analytics_snippet_files():
+    WATCH_INPUTS[snippet_file] = ('home', 'faq')
+
+def input_mtime(path):
+    try:
+        return os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+def read_existing_outputs():
+    """Current content of the built text files in public/"""
+    existing = {}
+    for pattern in ('public/*.html', 'public/*.json', 'public/_redirects', 'public/assets/*'):
+        for path in glob.glob(pattern):
+            with open(path, 'r') as f:
+                existing[path] = f.read()
+    return existing
+
+def watch(port, interval=0.1):
+    """Rebuild only the pages affected by an edited input and live-reload open tabs"""
+    preview = PreviewServer(port=port)
+    preview.start()
     
-    # Save home page
-    with open('public/index.html', 'w') as f:
-        f.write(home_html)
-    print("Home page extracted and saved to public/index.html")
+    version = load_version_data().get('version', '1.01')
+    previous = read_existing_outputs()
+    mtimes = {path: input_mtime(path) for path in WATCH_INPUTS}
     
-    # Extract other pages
-    extract_other_pages()
+    print(f"Preview with live reload at {preview.url}")
+    print(f"Watching {len(WATCH_INPUTS)} inputs (Ctrl+C to stop)...")
+    
+    try:
+        while True:
+            time.sleep(interval)
+            
+            stale = set()
+            for path, pages in WATCH_INPUTS.items():
+                mtime = input_mtime(path)
+                if mtime != mtimes[path]:
+                    mtimes[path] = mtime
+                    stale.update(pages)
+                    print(f"\n{path} changed")
+            if not stale:
+                continue
+            
+            started = time.perf_counter()
+            outputs = {}
+            for page in sorted(stale):
+                try:
+                    outputs.update(PAGE_BUILDERS[page]())
+                except Exception as e:
+                    print(f"  Failed to rebuild {page}: {e}")
+            apply_critical_css(outputs, SITE_CSS)
+            outputs = {path: content.replace(BUILD_VERSION_PLACEHOLDER, version) for path, content in outputs.items()}
+            
+            write_outputs(outputs)
+            # Compare with what was last built - the FAQ generator writes its own files
+            changed = sorted(path for path, content in outputs.items() if previous.get(path) != content)
+            previous.update(outputs)
+            elapsed = (time.perf_counter() - started) * 1000
+            
+            reloaded = preview.notify([os.path.relpath(path, 'public') for path in changed]) if changed else 0
+            print(f"  Rebuilt {', '.join(sorted(stale))} in {elapsed:.0f}ms - "
+                  f"{len(changed)} file(s) changed, {reloaded} tab(s) notified")
+    except KeyboardInterrupt:
+        preview.stop()
+
+def main(argv=None):
+    """Main extraction process"""
+    parser = argparse.ArgumentParser(description='Build the static site from the Rails app')
+    parser.add_argument('--deterministic', action='store_true',
+                        help='Only bump the version when the built content changes; identical inputs give identical output')
+    parser.add_argument('--watch', action='store_true',
+                        help='Serve public/ with live reload and rebuild pages when their inputs change')
+    parser.add_argument('--port', type=int, default=3456, help='Preview port for --watch')
+    args = parser.parse_args(argv)
+    
+    if args.watch:
+        watch(args.port)
+        return
+    
+    print("Starting static page extraction...")
+    print("=" * 50)
+    
+    version_data = load_version_data()
+    current_version = version_data.get('version', '1.01')
+    
+    try:
+        outputs = build_outputs()
+    except RuntimeError as e:
+        raise SystemExit(f"\nBuild failed - nothing written: {e}")
+    
+    if args.deterministic:
+        # Bump only when the content (ignoring the version itself) changed
+        build_hash = content_hash(outputs)
+        if build_hash == version_data.get('content_hash'):
+            new_version = current_version
+            print(f"\nContent unchanged - keeping version {new_version}")
+        else:
+            new_version = next_version(current_version)
+            version_data['version'] = new_version
+            version_data['content_hash'] = build_hash
+            version_data['last_updated'] = build_timestamp()
+            save_version_data(version_data)
+            print(f"\nContent changed - building version {new_version}")
+    else:
+        new_version = next_version(current_version)
+        version_data['version'] = new_version
+        version_data['last_updated'] = build_timestamp()
+        save_version_data(version_data)
+        print(f"\nBuilding version {new_version}...")
+    
+    outputs = {path: content.replace(BUILD_VERSION_PLACEHOLDER, new_version) for path, content in outputs.items()}
+    changed = write_outputs(outputs)
     
     print("\n" + "=" * 50)
     print(f"Version {new_version} generated at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
@@ -475,9 +752,12 @@ def main():
     print("  - Privacy page (privacy.html) - extracted from Rails")
     print("  - Cookies page (cookies.html) - extracted from Rails")
     print("  - Terms page (terms.html) - extracted from Rails")
+    print(f"\nFiles changed: {len(changed)} of {len(outputs)}")
+    for path in changed:
+        print(f"  - {path}")
     print("\nNext steps:")
     print("1. Commit and push to deploy to Cloudflare Pages")
     print("2. All pages will be available on the public site")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
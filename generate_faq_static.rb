@@ -3,6 +3,11 @@
 
 require 'erb'
 require 'json'
+require 'digest'
+
+# Search index settings - keep tokenize/stem in sync with the search script in faq_template.erb
+FIELD_WEIGHTS = { q: 3, section: 2, a: 1 }
+STOP_WORDS = %w[a an and are as at be by can do does for from how i if in is it of on or our so that the this to we what when with you your].freeze
 
 # FAQ data structure
 faqs = [
@@ -102,13 +107,66 @@ faqs = [
   }
 ]
 
+# Light suffix-stripping stemmer so "calls", "calling" and "called" share a term
+def stem(word)
+  return word if word.length <= 3
+  if word.end_with?('ies') && word.length > 4
+    word = word[0...-3] + 'y'
+  elsif word.end_with?('ing') && word.length > 5
+    word = word[0...-3]
+  elsif word.end_with?('ed') && word.length > 4
+    word = word[0...-2]
+  elsif word.end_with?('ly') && word.length > 4
+    word = word[0...-2]
+  elsif word.end_with?('s') && !word.end_with?('ss') && word.length > 3
+    word = word[0...-1]
+  end
+  word = word[0...-1] if word.end_with?('e') && word.length > 4
+  word
+end
+
+def tokenize(text)
+  text.gsub(/<[^>]*>/, ' ').downcase.scan(/[a-z0-9]+/).reject { |t| STOP_WORDS.include?(t) }.map { |t| stem(t) }
+end
+
+# Build an inverted index of term => [question_id, score, question_id, score, ...]
+# Question ids match the answer-N / icon-N ids the template assigns
+def build_search_index(faqs)
+  postings = Hash.new { |h, k| h[k] = Hash.new(0) }
+  question_id = 0
+  faqs.each do |section|
+    section[:questions].each do |qa|
+      question_id += 1
+      { q: qa[:q], section: section[:section], a: qa[:a] }.each do |field, text|
+        tokenize(text).each { |term| postings[term][question_id] += FIELD_WEIGHTS[field] }
+      end
+    end
+  end
+  postings.keys.sort.each_with_object({}) do |term, index|
+    index[term] = postings[term].sort.flatten
+  end
+end
+
 # Change to the cloudflare-pages directory to ensure paths work correctly
 Dir.chdir(File.dirname(__FILE__))
 
+# Write the search index under a content-hashed name so it can be cached forever
+search_json = JSON.generate(build_search_index(faqs))
+search_index_path = "/faq-search.#{Digest::SHA256.hexdigest(search_json)[0, 10]}.json"
+Dir.glob('public/faq-search.*.json').each { |old| File.delete(old) unless "/#{File.basename(old)}" == search_index_path }
+File.write("public#{search_index_path}", search_json)
+
+# Analytics snippet for this page; modes and their snippet files are defined in site_config.json
+site_config = JSON.parse(File.read('site_config.json'))
+analytics = site_config['analytics']
+analytics_mode = site_config['pages'].fetch('faq', {}).fetch('analytics', analytics['default'])
+snippet_file = analytics['snippets'].fetch(analytics_mode)
+analytics_snippet = snippet_file ? File.read(snippet_file).gsub('GA_MEASUREMENT_ID', analytics['measurement_id']) : ''
+
 # Generate the HTML
 template = ERB.new(File.read('faq_template.erb'))
 html = template.result(binding)
 
-# Save the file
-File.write('public/faq.html', html)
+# Save the file (the Python build passes FAQ_OUTPUT to post-process the page before it lands in public/)
+File.write(ENV.fetch('FAQ_OUTPUT', 'public/faq.html'), html)
 puts "FAQ page generated successfully!"
\ No newline at end of file
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Preview server for public/ with live reload
+
+Serves the built site the way Cloudflare Pages does (/faq -> faq.html) and
+injects a small script into every HTML page that listens for reload events
+on /__livereload. Call notify() with the changed output files and any open
+tab showing one of them reloads.
+
+Usage:
+    python3 live_reload.py [PORT]
+"""
+
+import os
+import sys
+import json
+import queue
+import threading
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+EVENTS_PATH = '/__livereload'
+
+RELOAD_SCRIPT = '''<script>
+(function() {
+    var page = location.pathname.replace(/^\\//, '') || 'index.html';
+    if (page.indexOf('.') === -1) page += '.html';
+    new EventSource('%s').onmessage = function(event) {
+        var changed = JSON.parse(event.data);
+        // Reload when this page or any shared asset (css, js, images) changed
+        if (changed.some(function(path) { return path === page || !/\\.html$/.test(path); })) {
+            location.reload();
+        }
+    };
+})();
+</script>
+''' % EVENTS_PATH
+
+
+class PreviewServer:
+    """Static file server with a live-reload event stream"""
+
+    def __init__(self, root='public', port=3456):
+        self.root = os.path.abspath(root)
+        self.clients = set()
+        self.lock = threading.Lock()
+        handler = partial(PreviewHandler, self, directory=self.root)
+        self.server = ThreadingHTTPServer(('127.0.0.1', port), handler)
+        self.server.daemon_threads = True
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server.server_port}/"
+
+    def start(self):
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def notify(self, changed_paths):
+        """Send changed output paths (relative to the root) to every open tab"""
+        with self.lock:
+            clients = list(self.clients)
+        for client in clients:
+            client.put(list(changed_paths))
+        return len(clients)
+
+
+class PreviewHandler(SimpleHTTPRequestHandler):
+    def __init__(self, preview, *args, **kwargs):
+        self.preview = preview
+        super().__init__(*args, **kwargs)
+
+    def do_GET(self):
+        path = self.path.split('?', 1)[0].split('#', 1)[0]
+        if path == EVENTS_PATH:
+            return self.stream_events()
+
+        # Pretty URLs, as on Cloudflare Pages
+        if path != '/' and '.' not in os.path.basename(path):
+            if os.path.isfile(os.path.join(self.preview.root, path.lstrip('/') + '.html')):
+                path += '.html'
+        if path.endswith('/'):
+            path += 'index.html'
+
+        file_path = self.translate_path(path)
+        if path.endswith('.html') and os.path.isfile(file_path):
+            return self.send_html(file_path)
+        self.path = path
+        return super().do_GET()
+
+    def send_html(self, file_path):
+        with open(file_path, 'rb') as f:
+            content = f.read()
+        script = RELOAD_SCRIPT.encode('utf-8')
+        if b'</body>' in content:
+            content = content.replace(b'</body>', script + b'</body>', 1)
+        else:
+            content += script
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(content)))
+        self.send_header('Cache-Control', 'no-cache')
+        self.end_headers()
+        self.wfile.write(content)
+
+    def stream_events(self):
+        client = queue.Queue()
+        with self.preview.lock:
+            self.preview.clients.add(client)
+        try:
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/event-stream')
+            self.send_header('Cache-Control', 'no-cache')
+            self.end_headers()
+            while True:
+                try:
+                    changed = client.get(timeout=15)
+                    self.wfile.write(f"data: {json.dumps(changed)}\n\n".encode('utf-8'))
+                except queue.Empty:
+                    # Keep the connection open through proxies
+                    self.wfile.write(b": ping\n\n")
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+        finally:
+            with self.preview.lock:
+                self.preview.clients.discard(client)
+
+    def log_message(self, format, *args):
+        pass
+
+
+if __name__ == "__main__":
+    port = int(sys.argv[1]) if len(sys.argv) > 1 else 3456
+    preview = PreviewServer(port=port)
+    print(f"Serving public/ at {preview.url} (Ctrl+C to stop)")
+    try:
+        preview.server.serve_forever()
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,495 @@
+#!/usr/bin/env python3
+"""
+Load test the /api/contact submission path
+
+Posts realistic multipart contact form submissions (including honeypot and
+invalid-email cases) at a fixed rate against either a local preview
+(`wrangler pages dev`) or a built-in stand-in for functions/api/contact.js.
+Local sink servers stand in for the Discord and custom webhooks and can
+inject latency and failures.
+
+Usage:
+    # Against the built-in stand-in
+    python3 load_test_contact.py --rate 20 --duration 30
+
+    # Against the local preview (point the webhooks at the sinks first)
+    DISCORD_WEBHOOK_URL=http://127.0.0.1:9101/discord \\
+    CUSTOM_WEBHOOK_URL=http://127.0.0.1:9102/custom \\
+        wrangler pages dev public --port 3456
+    python3 load_test_contact.py --target http://localhost:3456/api/contact
+"""
+
+import argparse
+import json
+import math
+import os
+import random
+import re
+import threading
+import time
+import urllib.error
+import urllib.request
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from email.parser import BytesParser
+from email.policy import HTTP
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Same pattern as functions/api/contact.js
+EMAIL_REGEX = re.compile(r'^[^\s@]+@[^\s@]+\.[^\s@]+$')
+
+TOPICS = [
+    'Requesting a demo',
+    'Pricing information',
+    'Technical questions',
+    'Partnership opportunities',
+    'Other',
+]
+
+FIRST_NAMES = ['Maria', 'James', 'Linda', 'Robert', 'Patricia', 'Michael', 'Susan', 'David']
+LAST_NAMES = ['Garcia', 'Smith', 'Johnson', 'Brown', 'Miller', 'Davis', 'Wilson', 'Moore']
+FACILITY_WORDS = ['Oak', 'Maple', 'Willow', 'Sunrise', 'Harbor', 'Meadow', 'Cedar', 'Pine']
+INVALID_EMAILS = ['not-an-email', 'missing-at.example.com', 'two@@example.com', 'spaces in@example.com', 'user@nodot']
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a list of numbers"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100.0 * len(ordered)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+def format_ms(value):
+    return '-' if value is None else f"{value:.1f}ms"
+
+
+class Sink:
+    """A local webhook receiver that can inject latency and failures"""
+
+    def __init__(self, name, port, latency_ms=0, jitter_ms=0, failure_rate=0.0):
+        self.name = name
+        self.port = port
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.failure_rate = failure_rate
+        self.lock = threading.Lock()
+        self.arrivals = {}
+        self.received = 0
+        self.failed = 0
+        self.server = ThreadingHTTPServer(('127.0.0.1', port), self._make_handler())
+        self.server.daemon_threads = True
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server.server_port}/{self.name}"
+
+    def _make_handler(self):
+        sink = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                arrived = time.perf_counter()
+                body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+                email = extract_email(body)
+
+                delay = sink.latency_ms + random.uniform(0, sink.jitter_ms)
+                if delay:
+                    time.sleep(delay / 1000.0)
+                fail = random.random() < sink.failure_rate
+
+                with sink.lock:
+                    sink.received += 1
+                    if fail:
+                        sink.failed += 1
+                    if email:
+                        sink.arrivals[email] = arrived
+
+                self.send_response(500 if fail else 204)
+                self.end_headers()
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def start(self):
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def extract_email(body):
+    """Find the submitter email in a custom webhook or Discord payload"""
+    try:
+        payload = json.loads(body)
+    except ValueError:
+        return None
+    if 'email' in payload:
+        return payload['email']
+    for embed in payload.get('embeds', []):
+        for field in embed.get('fields', []):
+            if field.get('name') == 'Email':
+                return field.get('value')
+    return None
+
+
+def post_json(url, data):
+    """POST a JSON payload, raising on a non-2xx response"""
+    request = urllib.request.Request(
+        url,
+        data=json.dumps(data).encode('utf-8'),
+        headers={'Content-Type': 'application/json'},
+        method='POST'
+    )
+    with urllib.request.urlopen(request, timeout=30) as response:
+        response.read()
+
+
+class ContactStandIn:
+    """A local stand-in for functions/api/contact.js
+
+    Applies the same honeypot check and validation, then fans out to the
+    configured webhooks (and optional KV directory) in parallel, failing the
+    request if any notification fails - the same as Promise.all() does.
+    """
+
+    def __init__(self, port, discord_url=None, custom_url=None, kv_dir=None):
+        self.discord_url = discord_url
+        self.custom_url = custom_url
+        self.kv_dir = kv_dir
+        self.fanout = ThreadPoolExecutor(max_workers=64)
+        if kv_dir:
+            os.makedirs(kv_dir, exist_ok=True)
+        self.server = ThreadingHTTPServer(('127.0.0.1', port), self._make_handler())
+        self.server.daemon_threads = True
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server.server_port}/api/contact"
+
+    def _make_handler(self):
+        stand_in = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+                status, payload = stand_in.handle(self.headers, body)
+                data = payload.encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json' if status != 400 else 'text/plain')
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def handle(self, headers, body):
+        form = parse_multipart(headers.get('Content-Type', ''), body)
+        data = {
+            'topic': form.get('topic'),
+            'other_topic': form.get('other_topic'),
+            'name': form.get('name'),
+            'email': form.get('email'),
+            'facility_name': form.get('facility_name'),
+            'resident_count': form.get('resident_count'),
+            'phone': form.get('phone'),
+            'current_solution': form.get('current_solution'),
+            'contact_preference': form.get('contact_preference'),
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S.000Z', time.gmtime()),
+            'ip': '127.0.0.1',
+            'country': 'XX'
+        }
+
+        if form.get('_gotcha'):
+            return 400, 'Form submission detected as spam'
+        if not data['email'] or not data['phone'] or not data['topic']:
+            return 400, 'Missing required fields'
+        if not EMAIL_REGEX.match(data['email']):
+            return 400, 'Invalid email address'
+
+        notifications = []
+        if self.discord_url:
+            notifications.append(self.fanout.submit(post_json, self.discord_url, discord_message(data)))
+        if self.custom_url:
+            notifications.append(self.fanout.submit(post_json, self.custom_url, data))
+        if self.kv_dir:
+            notifications.append(self.fanout.submit(self.store_in_kv, data))
+
+        try:
+            for notification in notifications:
+                notification.result()
+        except Exception:
+            return 500, json.dumps({'success': False, 'message': 'An error occurred. Please try again later.'})
+
+        return 200, json.dumps({'success': True, 'message': "Thank you for your interest! We'll be in touch soon."})
+
+    def store_in_kv(self, data):
+        key = f"contact_{int(time.time() * 1000)}_{data['email']}"
+        with open(os.path.join(self.kv_dir, key), 'w') as f:
+            json.dump(data, f)
+
+    def start(self):
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.fanout.shutdown(wait=False)
+
+
+def parse_multipart(content_type, body):
+    """Parse a multipart/form-data body into a dict of text fields"""
+    message = BytesParser(policy=HTTP).parsebytes(
+        b'Content-Type: ' + content_type.encode('latin-1') + b'\r\n\r\n' + body
+    )
+    fields = {}
+    if not message.is_multipart():
+        return fields
+    for part in message.iter_parts():
+        name = part.get_param('name', header='content-disposition')
+        if name:
+            fields[name] = part.get_content().strip() if part.get_content_type() == 'text/plain' else ''
+    return fields
+
+
+def discord_message(data):
+    """Minimal Discord embed carrying the fields the sinks look for"""
+    return {
+        'embeds': [{
+            'title': 'New Contact Form Submission',
+            'fields': [
+                {'name': 'Topic', 'value': data['topic']},
+                {'name': 'Email', 'value': data['email']},
+                {'name': 'Phone', 'value': data['phone']},
+            ]
+        }]
+    }
+
+
+def make_submission(kind, run_id, number):
+    """Build one realistic set of form fields of the given kind"""
+    first = random.choice(FIRST_NAMES)
+    last = random.choice(LAST_NAMES)
+    topic = random.choice(TOPICS)
+    fields = {
+        'topic': topic,
+        'other_topic': 'Integration with our nurse call system' if topic == 'Other' else '',
+        'name': f"{first} {last}",
+        'email': f"loadtest+{run_id}-{number}@example.com",
+        'facility_name': f"{random.choice(FACILITY_WORDS)} {random.choice(['Gardens', 'Commons', 'Village'])}",
+        'resident_count': str(random.randint(20, 400)),
+        'phone': f"555-{random.randint(100, 999)}-{random.randint(1000, 9999)}",
+        'current_solution': random.choice(['Manual door checks', 'Door flags', 'Pendant system', '']),
+        'contact_preference': random.choice(['Mornings by phone', 'Email is best', '']),
+        '_gotcha': '',
+    }
+    if kind == 'honeypot':
+        fields['_gotcha'] = 'http://spam.example.com'
+    elif kind == 'invalid_email':
+        fields['email'] = random.choice(INVALID_EMAILS)
+    return fields
+
+
+def encode_multipart(fields):
+    """Encode form fields the way a browser FormData POST does"""
+    boundary = '----LoadTestBoundary' + uuid.uuid4().hex
+    lines = []
+    for name, value in fields.items():
+        lines.append(f'--{boundary}')
+        lines.append(f'Content-Disposition: form-data; name="{name}"')
+        lines.append('')
+        lines.append(value)
+    lines.append(f'--{boundary}--')
+    lines.append('')
+    return '\r\n'.join(lines).encode('utf-8'), f'multipart/form-data; boundary={boundary}'
+
+
+def send_submission(target, kind, fields, scheduled):
+    """POST one submission and return its result record
+
+    Latency is measured from the scheduled arrival time, so time spent
+    waiting for a free worker counts (no coordinated omission).
+    """
+    body, content_type = encode_multipart(fields)
+    request = urllib.request.Request(target, data=body, headers={'Content-Type': content_type}, method='POST')
+    sent = time.perf_counter()
+    try:
+        with urllib.request.urlopen(request, timeout=30) as response:
+            response.read()
+            status = response.status
+    except urllib.error.HTTPError as e:
+        status = e.code
+    except Exception:
+        status = None
+    finished = time.perf_counter()
+
+    expected = 200 if kind == 'valid' else 400
+    return {
+        'kind': kind,
+        'email': fields['email'],
+        'status': status,
+        'ok': status == expected,
+        'scheduled': scheduled,
+        'sent': sent,
+        'queued_ms': max(0.0, sent - scheduled) * 1000.0,
+        'latency_ms': (finished - scheduled) * 1000.0,
+    }
+
+
+def run_load(target, rate, duration, honeypot_ratio, invalid_ratio, concurrency):
+    """Send submissions at a fixed arrival rate, independent of response times"""
+    run_id = uuid.uuid4().hex[:8]
+    total = int(rate * duration)
+    interval = 1.0 / rate
+    futures = []
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        start = time.perf_counter()
+        for number in range(total):
+            roll = random.random()
+            if roll < honeypot_ratio:
+                kind = 'honeypot'
+            elif roll < honeypot_ratio + invalid_ratio:
+                kind = 'invalid_email'
+            else:
+                kind = 'valid'
+
+            scheduled = start + number * interval
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            futures.append(pool.submit(send_submission, target, kind, make_submission(kind, run_id, number), scheduled))
+
+        results = [future.result() for future in futures]
+        elapsed = time.perf_counter() - start
+
+    return results, elapsed
+
+
+def send_rate(results):
+    """Submissions per second actually put on the wire"""
+    if len(results) < 2:
+        return None
+    window = max(r['sent'] for r in results) - min(r['scheduled'] for r in results)
+    return (len(results) - 1) / window if window > 0 else None
+
+
+def print_report(results, elapsed, sinks, rate):
+    """Print latency percentiles, error rate and sink fan-out timing"""
+    print("\n" + "=" * 50)
+    print(f"Sent {len(results)} submissions in {elapsed:.1f}s ({len(results) / elapsed:.1f} req/s completed)")
+
+    achieved = send_rate(results)
+    queued = [r['queued_ms'] for r in results]
+    if achieved is not None and achieved < rate * 0.95:
+        print(f"WARNING: sent at {achieved:.1f}/s, below the target {rate:g}/s - all workers were busy, "
+              f"so submissions queued (p99 wait {format_ms(percentile(queued, 99))}). "
+              f"Raise --concurrency to offer the full rate")
+
+    latencies = [r['latency_ms'] for r in results]
+    errors = [r for r in results if not r['ok']]
+    error_rate = len(errors) / len(results) * 100 if results else 0.0
+
+    print("\nLatency (all submissions, from scheduled arrival, including queueing):")
+    print(f"  p50 {format_ms(percentile(latencies, 50))}  "
+          f"p95 {format_ms(percentile(latencies, 95))}  "
+          f"p99 {format_ms(percentile(latencies, 99))}")
+    print(f"\nError rate: {error_rate:.2f}% ({len(errors)} of {len(results)} had an unexpected status)")
+
+    print("\nBy case:")
+    for kind in ('valid', 'honeypot', 'invalid_email'):
+        subset = [r for r in results if r['kind'] == kind]
+        if not subset:
+            continue
+        statuses = {}
+        for r in subset:
+            statuses[r['status']] = statuses.get(r['status'], 0) + 1
+        status_text = ', '.join(f"{status}: {count}" for status, count in sorted(statuses.items(), key=str))
+        subset_latencies = [r['latency_ms'] for r in subset]
+        print(f"  {kind:<14} n={len(subset):<5} "
+              f"p50 {format_ms(percentile(subset_latencies, 50))}  "
+              f"p95 {format_ms(percentile(subset_latencies, 95))}  "
+              f"p99 {format_ms(percentile(subset_latencies, 99))}  [{status_text}]")
+
+    valid = [r for r in results if r['kind'] == 'valid']
+    if sinks and valid:
+        print("\nSink fan-out (submission sent -> webhook received):")
+        for sink in sinks:
+            offsets = [
+                (sink.arrivals[r['email']] - r['sent']) * 1000.0
+                for r in valid if r['email'] in sink.arrivals
+            ]
+            print(f"  {sink.name:<8} received {sink.received:<5} failed {sink.failed:<5} "
+                  f"p50 {format_ms(percentile(offsets, 50))}  "
+                  f"p95 {format_ms(percentile(offsets, 95))}  "
+                  f"p99 {format_ms(percentile(offsets, 99))}  "
+                  f"missing {len(valid) - len(offsets)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Load test the /api/contact submission path')
+    parser.add_argument('--target', help='Contact endpoint URL (default: start a local stand-in)')
+    parser.add_argument('--rate', type=float, default=10.0, help='Submissions per second')
+    parser.add_argument('--duration', type=float, default=10.0, help='Test length in seconds')
+    parser.add_argument('--concurrency', type=int, default=50, help='Maximum in-flight submissions')
+    parser.add_argument('--honeypot-ratio', type=float, default=0.05, help='Share of submissions with the honeypot filled')
+    parser.add_argument('--invalid-ratio', type=float, default=0.05, help='Share of submissions with an invalid email')
+    parser.add_argument('--sink-latency-ms', type=float, default=0.0, help='Fixed latency added by each webhook sink')
+    parser.add_argument('--sink-jitter-ms', type=float, default=0.0, help='Random extra latency added by each webhook sink')
+    parser.add_argument('--sink-failure-rate', type=float, default=0.0, help='Share of webhook calls the sinks fail with a 500')
+    parser.add_argument('--discord-port', type=int, default=9101, help='Port for the Discord webhook sink')
+    parser.add_argument('--custom-port', type=int, default=9102, help='Port for the custom webhook sink')
+    parser.add_argument('--no-sinks', action='store_true', help='Do not start webhook sinks')
+    parser.add_argument('--kv-dir', help='Directory the stand-in stores submissions in, one file per KV key')
+    args = parser.parse_args()
+
+    sinks = []
+    if not args.no_sinks:
+        for name, port in (('discord', args.discord_port), ('custom', args.custom_port)):
+            sink = Sink(name, port, args.sink_latency_ms, args.sink_jitter_ms, args.sink_failure_rate)
+            sink.start()
+            sinks.append(sink)
+            print(f"{name} sink listening at {sink.url}")
+
+    stand_in = None
+    target = args.target
+    if not target:
+        stand_in = ContactStandIn(
+            0,
+            discord_url=sinks[0].url if sinks else None,
+            custom_url=sinks[1].url if sinks else None,
+            kv_dir=args.kv_dir
+        )
+        stand_in.start()
+        target = stand_in.url
+        print(f"Contact stand-in listening at {target}")
+    elif sinks:
+        print("Make sure the preview was started with:")
+        print(f"  DISCORD_WEBHOOK_URL={sinks[0].url}")
+        print(f"  CUSTOM_WEBHOOK_URL={sinks[1].url}")
+
+    print(f"Sending {int(args.rate * args.duration)} submissions at {args.rate:g}/s to {target}...")
+    results, elapsed = run_load(
+        target, args.rate, args.duration,
+        args.honeypot_ratio, args.invalid_ratio, args.concurrency
+    )
+
+    # Give in-flight webhook deliveries a moment to land
+    time.sleep(0.2)
+    print_report(results, elapsed, sinks, args.rate)
+
+    if stand_in:
+        stand_in.stop()
+    for sink in sinks:
+        sink.stop()
+
+
+if __name__ == "__main__":
+    main()
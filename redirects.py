@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+"""
+Compile redirects.json into public/_redirects and check the rules
+
+redirects.json is the single source of truth for redirects. It is compiled
+into the Cloudflare Pages _redirects file and also drives the HTML link
+rewriting, so in-page links point straight at their final destination
+instead of costing visitors an extra 302.
+
+The check reports:
+- rules shadowed by an earlier splat rule (Cloudflare uses the first match)
+- rules already covered by a later splat rule with the same result
+- redirect chains, where a destination is itself redirected
+- redirect loops (links caught in one are left unchanged)
+- rules whose source is also a file in public/ (the file becomes unreachable)
+
+--app saves a new {app} URL in redirects.json, so later builds and
+update_links.py use it too.
+
+Usage:
+    python3 redirects.py [--check] [--app URL]
+"""
+
+import os
+import re
+import json
+import argparse
+
+REDIRECTS_FILE = 'redirects.json'
+OUTPUT_FILE = 'public/_redirects'
+PUBLIC_DIR = 'public'
+SITE_ORIGINS = ('https://residentcheckin.co', 'https://www.residentcheckin.co')
+MAX_HOPS = 10
+
+
+class RedirectLoop(ValueError):
+    """Raised by resolve when following redirects returns to an earlier path"""
+
+    def __init__(self, hops):
+        super().__init__(f"Redirect loop: {' -> '.join(hops)}")
+        self.hops = hops
+
+
+def load_config():
+    with open(REDIRECTS_FILE, 'r') as f:
+        return json.load(f)
+
+
+def app_url():
+    """The {app} URL currently set in redirects.json"""
+    return load_config().get('variables', {}).get('app')
+
+
+def set_app_url(url):
+    """Save a new {app} URL in redirects.json; returns the previous one"""
+    previous = app_url()
+    with open(REDIRECTS_FILE, 'r') as f:
+        text = f.read()
+    # Edit the value in place so the hand-written layout of the file is kept
+    text, count = re.subn(r'("app"\s*:\s*)"[^"]*"', lambda m: m.group(1) + json.dumps(url.rstrip('/')), text, count=1)
+    if not count:
+        raise ValueError(f"No variables.app entry in {REDIRECTS_FILE}")
+    with open(REDIRECTS_FILE, 'w') as f:
+        f.write(text)
+    return previous
+
+
+def load_rules():
+    """Rules from redirects.json with {variables} filled in"""
+    config = load_config()
+    variables = config.get('variables', {})
+    rules = []
+    for rule in config['rules']:
+        rules.append({
+            'from': rule['from'],
+            'to': rule['to'].format(**variables),
+            'status': rule.get('status', 302),
+        })
+    return rules
+
+
+def compile_redirects(rules):
+    """Render rules in Cloudflare Pages _redirects format"""
+    lines = [
+        '# Cloudflare Pages redirects file',
+        f'# Generated from {REDIRECTS_FILE} by redirects.py - edit that file instead',
+        '',
+    ]
+    for rule in rules:
+        lines.append(f"{rule['from']} {rule['to']} {rule['status']}")
+    return '\n'.join(lines) + '\n'
+
+
+def is_splat(source):
+    return source.endswith('*')
+
+
+def match(rule, path):
+    """Destination for path if the rule matches it, otherwise None"""
+    source = rule['from']
+    if is_splat(source):
+        prefix = source[:-1]
+        if path.startswith(prefix):
+            return rule['to'].replace(':splat', path[len(prefix):])
+        return None
+    return rule['to'] if path == source else None
+
+
+def first_match(rules, path):
+    for rule in rules:
+        destination = match(rule, path)
+        if destination is not None:
+            return rule, destination
+    return None, None
+
+
+def local_path(url):
+    """The site-relative path of url, or None if it leaves the site"""
+    for origin in SITE_ORIGINS:
+        if url.startswith(origin + '/'):
+            return url[len(origin):]
+    if url.startswith('/') and not url.startswith('//'):
+        return url
+    return None
+
+
+def resolve(rules, path):
+    """Follow redirects from path; returns (final URL, hops) or (None, 0) if none apply"""
+    seen = []
+    url = path
+    while len(seen) < MAX_HOPS:
+        site_path = local_path(url)
+        if site_path is None:
+            break
+        bare_path, suffix = split_suffix(site_path)
+        rule, destination = first_match(rules, bare_path)
+        if rule is None:
+            break
+        if bare_path in seen:
+            raise RedirectLoop(seen + [bare_path])
+        seen.append(bare_path)
+        url = destination + suffix
+    if not seen:
+        return None, 0
+    return url, len(seen)
+
+
+def split_suffix(path):
+    """Split /a/b?x=1#top into ('/a/b', '?x=1#top')"""
+    cut = len(path)
+    for marker in ('?', '#'):
+        index = path.find(marker)
+        if index != -1:
+            cut = min(cut, index)
+    return path[:cut], path[cut:]
+
+
+def public_files(root=PUBLIC_DIR):
+    files = set()
+    for dirpath, dirnames, filenames in os.walk(root):
+        for filename in filenames:
+            files.add('/' + os.path.relpath(os.path.join(dirpath, filename), root).replace(os.sep, '/'))
+    return files
+
+
+def served_files(path, files):
+    """Files in public/ that Cloudflare Pages would serve for path"""
+    candidates = {path, path + '.html', path.rstrip('/') + '/index.html'}
+    return sorted(candidates & files)
+
+
+def check_rules(rules, root=PUBLIC_DIR):
+    """List of (kind, message) problems found in the rules"""
+    problems = []
+    files = public_files(root) if os.path.isdir(root) else set()
+    loops = set()
+
+    for i, rule in enumerate(rules):
+        source = rule['from']
+        # A concrete path to test this rule's source against other rules
+        sample = source[:-1] + 'example' if is_splat(source) else source
+
+        for earlier in rules[:i]:
+            if earlier['from'] == source:
+                problems.append(('shadowed', f"{source} is defined twice; only the first rule applies"))
+            elif is_splat(earlier['from']) and match(earlier, sample) is not None and \
+                    (not is_splat(source) or source.startswith(earlier['from'][:-1])):
+                problems.append(('shadowed', f"{source} is never used - {earlier['from']} matches it first"))
+
+        if not is_splat(source):
+            for later in rules[i + 1:]:
+                if is_splat(later['from']) and match(later, source) == rule['to'] and later['status'] == rule['status']:
+                    problems.append(('redundant', f"{source} is already covered by {later['from']}"))
+                    break
+
+        try:
+            resolve(rules, sample)
+        except RedirectLoop as e:
+            # Report each cycle once; rules leading into it show up as chains
+            cycle = e.hops[e.hops.index(e.hops[-1]):]
+            if frozenset(cycle) not in loops:
+                loops.add(frozenset(cycle))
+                problems.append(('loop', str(RedirectLoop(cycle))))
+            if sample in cycle:
+                continue
+
+        destination = rule['to'].replace(':splat', 'example')
+        target = local_path(destination)
+        if target is not None:
+            next_rule, _ = first_match(rules, split_suffix(target)[0])
+            if next_rule is not None:
+                problems.append(('chain', f"{source} -> {rule['to']} is redirected again by {next_rule['from']}"))
+
+        if is_splat(source):
+            prefix = source[:-1]
+            conflicts = sorted(f for f in files if f.startswith(prefix))
+        else:
+            conflicts = served_files(source, files)
+        for conflict in conflicts:
+            problems.append(('local', f"{source} redirects away from public{conflict}, which can never be served"))
+
+    return problems
+
+
+def rewrite_links(html, rules):
+    """Point in-page links at their final destination to skip redirect hops"""
+    def replace(m):
+        try:
+            final, hops = resolve(rules, m.group(2))
+        except RedirectLoop:
+            # Reported by check_rules; keep the link as written
+            return m.group(0)
+        if not hops:
+            return m.group(0)
+        return f'{m.group(1)}="{final}"'
+    return re.sub(r'\b(href|action)="([^"]*)"', replace, html)
+
+
+def retarget_app_links(html, rules, previous_app):
+    """Re-resolve links that point at a previous {app} URL through the current rules
+
+    Links no rule covers are moved to the current {app} URL as they are.
+    """
+    current_app = app_url()
+    prefix = previous_app.rstrip('/') + '/'
+
+    def replace(m):
+        path = m.group(2)[len(prefix) - 1:]
+        try:
+            final, hops = resolve(rules, path)
+        except RedirectLoop:
+            hops = 0
+        return f'{m.group(1)}="{final if hops else current_app + path}"'
+    return re.sub(r'\b(href|action)="(' + re.escape(prefix) + r'[^"]*)"', replace, html)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compile redirects.json into public/_redirects')
+    parser.add_argument('--check', action='store_true', help='Only check the rules; exit 1 on problems')
+    parser.add_argument('--app', help='Save a new {app} URL in redirects.json, e.g. https://app.residentcheckin.co')
+    args = parser.parse_args()
+
+    if args.app and args.check:
+        parser.error('--app saves redirects.json; run it without --check')
+    if args.app:
+        print(f"{{app}}: {set_app_url(args.app)} -> {app_url()}")
+        print("Run update_links.py to move links in the built pages over as well")
+    rules = load_rules()
+    problems = check_rules(rules)
+    for kind, message in problems:
+        print(f"  [{kind}] {message}")
+
+    if args.check:
+        print(f"{len(rules)} rules, {len(problems)} problem(s)")
+        raise SystemExit(1 if problems else 0)
+
+    with open(OUTPUT_FILE, 'w') as f:
+        f.write(compile_redirects(rules))
+    print(f"Wrote {len(rules)} rules to {OUTPUT_FILE}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+"""
+Per-page site configuration shared by the page generators and build stages
+
+The settings live in site_config.json so the Ruby FAQ generator can read
+the same file. That includes the analytics modes: analytics.snippets maps
+each mode to its snippet file (null for none) and analytics.default is the
+mode for pages that do not set one.
+"""
+
+import json
+
+CONFIG_FILE = 'site_config.json'
+
+def load_site_config():
+    with open(CONFIG_FILE, 'r') as f:
+        return json.load(f)
+
+def analytics_snippet_files():
+    """Every snippet file an analytics mode can use"""
+    snippets = load_site_config()['analytics']['snippets']
+    return sorted(path for path in snippets.values() if path)
+
+def analytics_snippet(page):
+    """The Google Analytics snippet configured for a page ('' when off)"""
+    config = load_site_config()
+    analytics = config['analytics']
+    mode = config['pages'].get(page, {}).get('analytics', analytics['default'])
+    snippet_file = analytics['snippets'][mode]
+    if not snippet_file:
+        return ''
+    with open(snippet_file, 'r') as f:
+        snippet = f.read()
+    return snippet.replace('GA_MEASUREMENT_ID', analytics['measurement_id'])
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Tests for deploy.py against a local directory target
+
+Run with: python3 -m pytest test_deploy.py
+"""
+
+import os
+import json
+import shutil
+from argparse import Namespace
+
+import pytest
+
+import deploy
+
+
+def write(path, content):
+    if os.path.dirname(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w') as f:
+        f.write(content)
+
+
+def read_tree(root):
+    tree = {}
+    for dirpath, _, filenames in os.walk(root):
+        for filename in filenames:
+            path = os.path.join(dirpath, filename)
+            with open(path, 'r') as f:
+                tree[os.path.relpath(path, root)] = f.read()
+    return tree
+
+
+def set_version(version):
+    version_data = deploy.load_version_data()
+    version_data['version'] = version
+    deploy.save_version_data(version_data)
+
+
+@pytest.fixture
+def site(tmp_path, monkeypatch):
+    """A public/ directory and version.json in a scratch working directory"""
+    monkeypatch.chdir(tmp_path)
+    write('version.json', json.dumps({'version': '1.01'}))
+    write('public/index.html', '<h1>Home v1</h1>')
+    write('public/faq.html', '<h1>FAQ</h1>')
+    write('public/assets/site.css', 'body{}')
+    return tmp_path
+
+
+def test_deploy_change_deploy_rollback(site, capsys):
+    target = str(site / 'target')
+
+    deploy.deploy(Namespace(target=target, dry_run=False))
+    assert read_tree(target) == read_tree('public')
+    v1 = read_tree(target)
+
+    set_version('1.02')
+    write('public/index.html', '<h1>Home v2</h1>')
+    os.remove('public/assets/site.css')
+    write('public/terms.html', '<h1>Terms</h1>')
+    deploy.deploy(Namespace(target=target, dry_run=False))
+    assert read_tree(target) == read_tree('public')
+
+    entry = deploy.load_version_data()['deployment_history'][-1]
+    assert (entry['added'], entry['changed'], entry['removed']) == (1, 1, 1)
+    # Only the new and changed files are transferred
+    assert entry['bytes_transferred'] == len('<h1>Home v2</h1>') + len('<h1>Terms</h1>')
+
+    deploy.rollback(Namespace(version='1.01', target=target))
+    assert read_tree(target) == v1
+    version_data = deploy.load_version_data()
+    assert version_data['deployed_version'] == '1.01'
+    assert version_data['deployment_history'][-1]['rolled_back_from'] == '1.02'
+
+
+def test_rollback_uses_the_target_history(site):
+    staging = str(site / 'staging')
+    production = str(site / 'production')
+
+    deploy.deploy(Namespace(target=production, dry_run=False))
+    set_version('1.02')
+    write('public/index.html', '<h1>Home v2</h1>')
+    deploy.deploy(Namespace(target=staging, dry_run=False))
+    deploy.deploy(Namespace(target=production, dry_run=False))
+
+    # 1.01 was never deployed to staging
+    with pytest.raises(SystemExit):
+        deploy.rollback(Namespace(version='1.01', target=staging))
+
+    set_version('1.03')
+    write('public/index.html', '<h1>Home v3</h1>')
+    deploy.deploy(Namespace(target=staging, dry_run=False))
+    deploy.rollback(Namespace(version='1.01', target=production))
+    assert read_tree(production)['index.html'] == '<h1>Home v1</h1>'
+    # Taken from production's last deploy, not the newer staging one
+    assert deploy.load_version_data()['deployment_history'][-1]['rolled_back_from'] == '1.02'
+
+
+def test_rollback_with_missing_objects_leaves_target_untouched(site):
+    target = str(site / 'target')
+
+    deploy.deploy(Namespace(target=target, dry_run=False))
+    set_version('1.02')
+    write('public/index.html', '<h1>Home v2</h1>')
+    write('public/faq.html', '<h1>FAQ v2</h1>')
+    deploy.deploy(Namespace(target=target, dry_run=False))
+    before = read_tree(target)
+    history = deploy.load_version_data()['deployment_history']
+
+    shutil.rmtree(deploy.OBJECT_STORE)
+    with pytest.raises(SystemExit, match='nothing was changed'):
+        deploy.rollback(Namespace(version='1.01', target=target))
+    assert read_tree(target) == before
+    assert deploy.load_version_data()['deployment_history'] == history
@@ -1,27 +1,30 @@
 #!/usr/bin/env python3
 """
-Update links in the static HTML to point to production Rails app
+Update links in the static HTML to point to their final destination
+
+Links are resolved through the rules in redirects.json, so visitors go
+straight to the Rails app instead of through a redirect. Passing a new
+Rails app URL saves it as {app} in redirects.json and moves links that
+point at the previous URL over to it.
 """
 
 import sys
+import glob
+
+from redirects import OUTPUT_FILE, load_rules, compile_redirects, rewrite_links, retarget_app_links, app_url, set_app_url
 
 # Configuration
-RAILS_APP_URL = "https://app.residentcheckin.co"  # Update this to your Rails app URL
+RAILS_APP_URL = None  # Saved as the {app} URL in redirects.json when set
 FORMSPREE_ID = "YOUR_FORM_ID"  # Update this to your Formspree form ID
 
-def update_links(filename):
+def update_links(filename, rules, previous_app):
     with open(filename, 'r') as f:
         content = f.read()
     
     # Update Rails app links
-    links_to_update = [
-        ('/facility/onboarding', f'{RAILS_APP_URL}/facility/onboarding'),
-        ('/users/sign_in', f'{RAILS_APP_URL}/users/sign_in'),
-        ('/faq', f'{RAILS_APP_URL}/faq'),
-    ]
-    
-    for old_link, new_link in links_to_update:
-        content = content.replace(f'href="{old_link}"', f'href="{new_link}"')
+    if previous_app:
+        content = retarget_app_links(content, rules, previous_app)
+    content = rewrite_links(content, rules)
     
     # Update Formspree form ID
     content = content.replace('YOUR_FORM_ID', FORMSPREE_ID)
@@ -30,8 +33,6 @@ def update_links(filename):
         f.write(content)
     
     print(f"Updated links in {filename}")
-    print(f"Rails app URL: {RAILS_APP_URL}")
-    print(f"Formspree ID: {FORMSPREE_ID}")
 
 if __name__ == "__main__":
     if len(sys.argv) > 1:
@@ -39,5 +40,17 @@ if __name__ == "__main__":
     if len(sys.argv) > 2:
         FORMSPREE_ID = sys.argv[2]
     
-    update_links('public/index.html')
-    print("\nUsage: python3 update_links.py [RAILS_APP_URL] [FORMSPREE_ID]")
\ No newline at end of file
+    previous_app = None
+    if RAILS_APP_URL and RAILS_APP_URL.rstrip('/') != app_url():
+        previous_app = set_app_url(RAILS_APP_URL)
+    rules = load_rules()
+    
+    for filename in sorted(glob.glob('public/*.html')):
+        update_links(filename, rules, previous_app)
+    if previous_app:
+        with open(OUTPUT_FILE, 'w') as f:
+            f.write(compile_redirects(rules))
+        print(f"Recompiled {OUTPUT_FILE}")
+    print(f"Rails app URL: {app_url()}" + (f" (was {previous_app})" if previous_app else ""))
+    print(f"Formspree ID: {FORMSPREE_ID}")
+    print("\nUsage: python3 update_links.py [RAILS_APP_URL] [FORMSPREE_ID]")